@@ -1,10 +1,10 @@
 import streamlit as st
-import sys
+import requests
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 
-# Add the current directory to Python path for imports
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-
+# `streamlit run` puts this file's directory on sys.path, so these resolve as-is
 from services.api_client import ApiClient
 from components.file_upload import file_upload_component
 from components.results_display import display_results, display_error, display_processing
@@ -20,9 +20,136 @@ st.set_page_config(
 # Initialize API client
 @st.cache_resource
 def get_api_client():
-    return ApiClient()
+    # BACKEND_PUBLIC_URL is the backend address browsers use for direct download links
+    return ApiClient(public_url=os.environ.get("BACKEND_PUBLIC_URL"))
+
+# Shared worker pool for requests that should not block the script thread
+@st.cache_resource
+def get_executor():
+    return ThreadPoolExecutor(max_workers=4)
+
+# Separate pool for sidebar lookups so they never queue behind long uploads
+@st.cache_resource
+def get_sidebar_executor():
+    return ThreadPoolExecutor(max_workers=2)
+
+def _check_backend(base_url: str) -> str:
+    """Return "ok", "warn" or "down" for the backend at base_url."""
+    try:
+        response = get_api_client().session.get(f"{base_url}/test", timeout=5)
+    except requests.exceptions.RequestException:
+        return "down"
+    if response.status_code in [200, 404]:  # 404 is fine, means server is running
+        return "ok"
+    return "warn"
+
+@st.cache_data(ttl=5)
+def _sidebar_fetch():
+    """Backend status and recent files for the sidebar, fetched concurrently.
+    
+    Cached briefly so unrelated reruns skip both requests.
+    """
+    api_client = get_api_client()
+    files = get_sidebar_executor().submit(api_client.list_files)
+    status = _check_backend(api_client.base_url)
+    try:
+        return status, files.result(timeout=10)
+    except FutureTimeoutError:
+        return status, None
+
+@st.cache_data(ttl=300, max_entries=64)
+def _cached_get_result(file_id: str):
+    """Results for a completed file; raises LookupError so failed lookups aren't cached."""
+    result = get_api_client().get_file_result(file_id)
+    if result is None:
+        raise LookupError(file_id)
+    return result
+
+def _load_result(file_id: str, status: str):
+    """Results for a file, served from the cache only once its job has completed."""
+    if status != "completed":
+        return get_api_client().get_file_result(file_id)
+    try:
+        return _cached_get_result(file_id)
+    except LookupError:
+        return None
+
+@st.fragment
+def _sidebar_recent() -> None:
+    """Recent files picker; reruns on its own when its widgets change."""
+    st.header("🗂️ Recent Files")
+    _, files = _sidebar_fetch()
+    if files:
+        # Build options as "filename (status)"
+        options = {f"{f['filename']} ({f['status']}{' • ' + f['category'] if f.get('category') else ''})": f for f in files}
+        selection = st.selectbox("Select a file", list(options.keys()))
+        if st.button("Load Selected"):
+            selected = options[selection]
+            result = _load_result(selected['id'], selected['status']) or {"error": True, "message": "Not found"}
+            st.session_state['last_result'] = result
+            # The results panel is outside this fragment, so rerun the whole page
+            st.rerun()
+    else:
+        st.caption("No files yet.")
+
+def _clear_results() -> None:
+    # Runs as a widget callback, before the panel re-renders
+    st.session_state.pop('last_result', None)
+
+@st.fragment
+def _results_panel(api_client: ApiClient) -> None:
+    """Results for the last processed file; reruns on its own when its widgets change."""
+    if 'last_result' not in st.session_state:
+        return
+    result = st.session_state['last_result']
+    
+    st.markdown("---")
+    
+    # Add clear results button
+    col1, col2 = st.columns([3, 1])
+    with col2:
+        st.button("🗑️ Clear Results", on_click=_clear_results)
+    
+    # Check for different types of errors/issues
+    if result.get('error'):
+        # Direct API error
+        display_error(result.get('message', 'Unknown error occurred'))
+    elif result.get('category') == 'processing':
+        # File is still being processed
+        st.info("🔄 Your document is still being processed. Please wait...")
+    elif result.get('category') == 'other' and result.get('confidenceScore', 0) == 0.0:
+        # Processing failed but returned a response
+        display_error("Unable to categorize this document. The AI service may be having issues.")
+    else:
+        # Successful processing
+        display_results(result)
+        
+        # Download original file section
+        if result.get('fileId'):
+            st.markdown("---")
+            st.subheader("💾 Download Original File")
+            
+            # The browser fetches straight from the backend, which sends it as an attachment
+            st.link_button("📥 Download Original", api_client.download_url(result['fileId']))
 
 def main():
+    # Collect a finished upload before anything renders, so this run shows it
+    future = st.session_state.get('upload_future')
+    if future is not None and future.done():
+        del st.session_state['upload_future']
+        del st.session_state['upload_progress']
+        try:
+            st.session_state['last_result'] = future.result()
+        except Exception as e:
+            # Same shape as ApiClient.upload_file's own failures
+            st.session_state['last_result'] = {
+                "error": True,
+                "message": f"Upload failed: {str(e)}",
+                "fileId": None
+            }
+        _cached_get_result.clear()
+        _sidebar_fetch.clear()
+    
     # Header
     st.title("📄 Tunic Pay Document Processor")
     st.markdown("---")
@@ -50,18 +177,14 @@ def main():
             st.write(f"• {category}")
         
         st.header("🔧 System Status")
-        api_client = get_api_client()
         
         # Simple health check
-        try:
-            # Try to make a request to check if backend is running
-            import requests
-            response = requests.get(f"{api_client.base_url}/test", timeout=5)
-            if response.status_code in [200, 404]:  # 404 is fine, means server is running
-                st.success("✅ Backend Connected")
-            else:
-                st.warning("⚠️ Backend Issues")
-        except:
+        status, _ = _sidebar_fetch()
+        if status == "ok":
+            st.success("✅ Backend Connected")
+        elif status == "warn":
+            st.warning("⚠️ Backend Issues")
+        else:
             st.error("❌ Backend Offline")
     
     # Main content area
@@ -69,86 +192,39 @@ def main():
     
     # Sidebar: recent files list
     with st.sidebar:
-        st.header("🗂️ Recent Files")
-        files = api_client.list_files() or []
-        if files:
-            # Build options as "filename (status)"
-            options = {f"{f['filename']} ({f['status']}{' • ' + f['category'] if f.get('category') else ''})": f['id'] for f in files}
-            selection = st.selectbox("Select a file", list(options.keys()))
-            if st.button("Load Selected"):
-                selected_id = options[selection]
-                result = api_client.get_file_result(selected_id) or {"error": True, "message": "Not found"}
-                st.session_state['last_result'] = result
-                st.rerun()
-        else:
-            st.caption("No files yet.")
+        _sidebar_recent()
 
     # File upload section
     file_data = file_upload_component()
     
     if file_data:
-        file_bytes, filename = file_data
+        file_obj, filename = file_data
         
         # Process button
-        if st.button("🚀 Process Document", type="primary", use_container_width=True):
+        uploading = 'upload_future' in st.session_state
+        if st.button("🚀 Process Document", type="primary", use_container_width=True, disabled=uploading):
             # Clear previous results when starting new processing
             if 'last_result' in st.session_state:
                 del st.session_state['last_result']
             
-            # Show processing indicator
-            with st.spinner("Processing document..."):
-                # Upload and process file
-                result = api_client.upload_file(file_bytes, filename)
-                
-                # Store result in session state
-                st.session_state['last_result'] = result
-                
-                # Force UI refresh
-                st.rerun()
+            # Upload in the background so the page keeps rendering
+            progress = st.session_state['upload_progress'] = {'fraction': 0.0}
+            
+            def on_progress(fraction: float) -> None:
+                progress['fraction'] = fraction
+            
+            st.session_state['upload_future'] = get_executor().submit(
+                api_client.upload_file, file_obj, filename, on_progress
+            )
+    
+    # Show progress for an in-flight upload and poll again shortly
+    if 'upload_future' in st.session_state:
+        display_processing(st.session_state['upload_progress']['fraction'])
+        time.sleep(0.3)
+        st.rerun()
     
     # Display results if available
-    if 'last_result' in st.session_state:
-        result = st.session_state['last_result']
-        
-        st.markdown("---")
-        
-        # Add clear results button
-        col1, col2 = st.columns([3, 1])
-        with col2:
-            if st.button("🗑️ Clear Results"):
-                del st.session_state['last_result']
-                st.rerun()
-        
-        # Check for different types of errors/issues
-        if result.get('error'):
-            # Direct API error
-            display_error(result.get('message', 'Unknown error occurred'))
-        elif result.get('category') == 'processing':
-            # File is still being processed
-            st.info("🔄 Your document is still being processed. Please wait...")
-        elif result.get('category') == 'other' and result.get('confidenceScore', 0) == 0.0:
-            # Processing failed but returned a response
-            display_error("Unable to categorize this document. The AI service may be having issues.")
-        else:
-            # Successful processing
-            display_results(result)
-            
-            # Download original file section
-            if result.get('fileId'):
-                st.markdown("---")
-                st.subheader("💾 Download Original File")
-                
-                if st.button("📥 Download Original"):
-                    file_content = api_client.download_file(result['fileId'])
-                    if file_content:
-                        st.download_button(
-                            label="💾 Save File",
-                            data=file_content,
-                            file_name=result.get('filename', 'document'),
-                            mime="application/octet-stream"
-                        )
-                    else:
-                        st.error("Failed to download file")
+    _results_panel(api_client)
     
     # Footer
     st.markdown("---")
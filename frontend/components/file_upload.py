@@ -1,9 +1,8 @@
 import streamlit as st
 from typing import Optional
-import io
 
 def file_upload_component() -> Optional[tuple]:
-    """File upload component that returns (file_bytes, filename) if a file is uploaded."""
+    """File upload component that returns (file_obj, filename) if a file is uploaded."""
     
     st.subheader("📄 Document Upload")
     st.write("Upload a document for categorization and content extraction.")
@@ -29,9 +28,9 @@ def file_upload_component() -> Optional[tuple]:
             for key, value in file_details.items():
                 st.write(f"**{key}:** {value}")
         
-        # Read file bytes
-        file_bytes = uploaded_file.read()
-        return file_bytes, uploaded_file.name
+        # Hand back the file-like object so the upload can stream it
+        uploaded_file.seek(0)
+        return uploaded_file, uploaded_file.name
     
     return None
 
@@ -1,7 +1,66 @@
 import streamlit as st
-import pandas as pd
-from typing import Dict, Any, List
-import io
+from collections import defaultdict
+from typing import TYPE_CHECKING, Dict, Any, List
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+# Entity confidence markers, indexed by how many thresholds (0.5, 0.8) are exceeded
+COLORS = ("🔴", "🟡", "🟢")
+
+
+def confidence_color(confidence: float) -> str:
+    """Return the marker for an entity confidence score."""
+    return COLORS[(confidence > 0.5) + (confidence > 0.8)]
+
+
+def _arrow_table(headers: List[str], rows: List[List[Any]]) -> "pa.Table":
+    """Build an Arrow table from an extracted table's headers and rows.
+    
+    Short rows are padded with nulls; rows with more cells than headers raise
+    ValueError, as pandas did.
+    """
+    # Imported here so pages without tables never load pyarrow
+    import pyarrow as pa
+    
+    width = len(headers)
+    for n, row in enumerate(rows, 1):
+        if len(row) > width:
+            raise ValueError(f"{width} columns passed, row {n} has {len(row)} cells")
+    
+    columns = []
+    for i in range(width):
+        values = [row[i] if i < len(row) else None for row in rows]
+        try:
+            columns.append(pa.array(values))
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            # Mixed-type column, fall back to strings
+            columns.append(pa.array([None if v is None else str(v) for v in values]))
+    return pa.table(columns, names=headers)
+
+
+def _csv_bytes(table: "pa.Table") -> bytes:
+    """Encode an Arrow table as CSV."""
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+    
+    buffer = pa.BufferOutputStream()
+    pacsv.write_csv(table, buffer, write_options=pacsv.WriteOptions(quoting_style="needed"))
+    return buffer.getvalue().to_pybytes()
+
+
+# Keyed on file ID and table index only; callers must have a file ID
+@st.cache_data(ttl=300, max_entries=64)
+def _table_arrow(file_id: str, idx: int, _headers: List[str], _rows: List[List[Any]]) -> "pa.Table":
+    """Arrow table for an extracted table, cached per file and table index."""
+    return _arrow_table(_headers, _rows)
+
+
+@st.cache_data(ttl=300, max_entries=64)
+def _table_csv(file_id: str, idx: int, _headers: List[str], _rows: List[List[Any]]) -> bytes:
+    """CSV for an extracted table, cached per file and table index."""
+    return _csv_bytes(_table_arrow(file_id, idx, _headers, _rows))
+
 
 def display_results(result: Dict[str, Any]) -> None:
     """Display processing results in a structured format."""
@@ -28,21 +87,22 @@ def display_results(result: Dict[str, Any]) -> None:
     if entities:
         st.subheader("🏷️ Extracted Entities")
         
-        # Group entities by type
-        entity_groups = {}
+        # Group entities by type as (value, confidence, color) in a single pass
+        entity_groups = defaultdict(list)
         for entity in entities:
-            entity_type = entity.get('type', 'unknown')
-            if entity_type not in entity_groups:
-                entity_groups[entity_type] = []
-            entity_groups[entity_type].append(entity)
+            confidence = entity.get('confidence', 0)
+            entity_groups[entity.get('type', 'unknown')].append(
+                (entity.get('value', 'N/A'), confidence, confidence_color(confidence))
+            )
         
         # Display entities in columns
         for entity_type, entity_list in entity_groups.items():
             with st.expander(f"{entity_type.replace('_', ' ').title()} ({len(entity_list)})", expanded=True):
-                for entity in entity_list:
-                    confidence = entity.get('confidence', 0)
-                    confidence_color = "🟢" if confidence > 0.8 else "🟡" if confidence > 0.5 else "🔴"
-                    st.write(f"{confidence_color} **{entity.get('value', 'N/A')}** (confidence: {confidence:.1%})")
+                # One markdown element per group; trailing double spaces force line breaks
+                st.markdown("  \n".join(
+                    f"{color} **{value}** (confidence: {confidence:.1%})"
+                    for value, confidence, color in entity_list
+                ))
     else:
         st.info("No entities extracted from this document.")
     
@@ -65,16 +125,18 @@ def display_results(result: Dict[str, Any]) -> None:
             
             with st.expander(f"📊 {table_name}", expanded=True):
                 if headers and rows:
-                    # Create DataFrame
                     try:
-                        df = pd.DataFrame(rows, columns=headers)
-                        st.dataframe(df, use_container_width=True)
+                        file_id = result.get('fileId')
+                        if file_id:
+                            arrow_table = _table_arrow(file_id, i, headers, rows)
+                            csv_data = _table_csv(file_id, i, headers, rows)
+                        else:
+                            # Without a file ID there is no safe cache key
+                            arrow_table = _arrow_table(headers, rows)
+                            csv_data = _csv_bytes(arrow_table)
+                        st.dataframe(arrow_table, use_container_width=True)
                         
                         # CSV download button
-                        csv_buffer = io.StringIO()
-                        df.to_csv(csv_buffer, index=False)
-                        csv_data = csv_buffer.getvalue()
-                        
                         st.download_button(
                             label=f"📥 Download {table_name} as CSV",
                             data=csv_data,
@@ -138,13 +200,9 @@ def display_error(error_message: str) -> None:
         st.rerun()
 
 
-def display_processing() -> None:
-    """Display processing indicator."""
+def display_processing(progress: float) -> None:
+    """Display processing indicator with the fraction of the upload sent so far."""
     st.info("🔄 Processing your document... This may take a few moments.")
     
-    # Progress bar (indeterminate)
-    progress_bar = st.progress(0)
-    import time
-    for i in range(100):
-        time.sleep(0.01)
-        progress_bar.progress(i + 1)
+    text = "Uploading..." if progress < 1 else "Upload complete, analyzing document..."
+    st.progress(progress, text=text)
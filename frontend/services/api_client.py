@@ -1,21 +1,68 @@
+import orjson
 import requests
-import json
-from typing import Optional, Dict, Any
+import mimetypes
+from requests.adapters import HTTPAdapter
+from requests_toolbelt import MultipartEncoder, MultipartEncoderMonitor
+from urllib3.util.retry import Retry
+from typing import Optional, Dict, Any, BinaryIO, Callable, Union
 
 class ApiClient:
-    def __init__(self, base_url: str = "http://localhost:8080"):
+    def __init__(self, base_url: str = "http://localhost:8080", public_url: Optional[str] = None):
         self.base_url = base_url
+        # Backend address as seen by the user's browser, if it differs from base_url
+        self.public_url = public_url or base_url
+        
+        # Endpoint URLs, built once rather than on every call
+        self._upload_url = f"{base_url}/api/files/upload"
+        self._files_url = f"{base_url}/api/files"
+        self._file_tmpl = f"{base_url}/api/files/{{}}"
+        self._download_tmpl = f"{self.public_url}/api/files/{{}}/download"
+        
+        # Pooled session so repeated calls reuse connections
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=8,
+            # Hand back the final 5xx response rather than raising RetryError
+            max_retries=Retry(
+                total=2,
+                backoff_factor=0.2,
+                status_forcelist=[502, 503, 504],
+                raise_on_status=False
+            )
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
     
-    def upload_file(self, file_bytes: bytes, filename: str) -> Dict[str, Any]:
-        """Upload a file and get processing results."""
-        url = f"{self.base_url}/api/files/upload"
-        files = {'file': (filename, file_bytes)}
+    def upload_file(
+        self,
+        file_obj: Union[BinaryIO, bytes],
+        filename: str,
+        progress_callback: Optional[Callable[[float], None]] = None
+    ) -> Dict[str, Any]:
+        """Upload a file and get processing results.
+        
+        File-like objects are streamed in chunks rather than read into memory.
+        If given, progress_callback receives the fraction of the body sent so far.
+        """
+        mimetype = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+        encoder = MultipartEncoder(fields={'file': (filename, file_obj, mimetype)})
+        if progress_callback is not None:
+            encoder = MultipartEncoderMonitor(
+                encoder,
+                lambda monitor: progress_callback(monitor.bytes_read / monitor.len)
+            )
         
         try:
-            response = requests.post(url, files=files, timeout=60)
+            response = self.session.post(
+                self._upload_url,
+                data=encoder,
+                headers={'Content-Type': encoder.content_type},
+                timeout=60
+            )
             response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
+            return orjson.loads(response.content)
+        except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
             return {
                 "error": True,
                 "message": f"Upload failed: {str(e)}",
@@ -24,32 +71,21 @@ class ApiClient:
     
     def get_file_result(self, file_id: str) -> Optional[Dict[str, Any]]:
         """Get processing results for a file."""
-        url = f"{self.base_url}/api/files/{file_id}"
-        
         try:
-            response = requests.get(url, timeout=30)
+            response = self.session.get(self._file_tmpl.format(file_id), timeout=30)
             response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException:
+            return orjson.loads(response.content)
+        except (requests.exceptions.RequestException, orjson.JSONDecodeError):
             return None
 
     def list_files(self) -> Optional[Any]:
-        url = f"{self.base_url}/api/files"
         try:
-            response = requests.get(url, timeout=30)
+            response = self.session.get(self._files_url, timeout=30)
             response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException:
+            return orjson.loads(response.content)
+        except (requests.exceptions.RequestException, orjson.JSONDecodeError):
             return None
     
-    def download_file(self, file_id: str) -> Optional[bytes]:
-        """Download the original file."""
-        url = f"{self.base_url}/api/files/{file_id}/download"
-        
-        try:
-            response = requests.get(url, timeout=30)
-            response.raise_for_status()
-            return response.content
-        except requests.exceptions.RequestException:
-            return None
-
+    def download_url(self, file_id: str) -> str:
+        """URL the browser can fetch the original file from directly."""
+        return self._download_tmpl.format(file_id)
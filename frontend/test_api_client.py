@@ -1,6 +1,9 @@
 import unittest
 from unittest.mock import patch, Mock
+import io
+import orjson
 import requests
+from requests_toolbelt import MultipartEncoder
 from services.api_client import ApiClient
 
 class TestApiClient(unittest.TestCase):
@@ -8,15 +11,15 @@ class TestApiClient(unittest.TestCase):
     def setUp(self):
         self.client = ApiClient("http://localhost:8080")
     
-    @patch('services.api_client.requests.post')
+    @patch('services.api_client.requests.Session.post')
     def test_upload_file_success(self, mock_post):
         # Mock successful response
         mock_response = Mock()
-        mock_response.json.return_value = {
+        mock_response.content = orjson.dumps({
             "fileId": "test-id",
             "category": "invoice",
             "confidenceScore": 0.95
-        }
+        })
         mock_response.raise_for_status.return_value = None
         mock_post.return_value = mock_response
         
@@ -26,7 +29,36 @@ class TestApiClient(unittest.TestCase):
         self.assertEqual(result["category"], "invoice")
         self.assertFalse(result.get("error", False))
     
-    @patch('services.api_client.requests.post')
+    @patch('services.api_client.requests.Session.post')
+    def test_upload_file_streams_multipart_body(self, mock_post):
+        mock_response = Mock()
+        mock_response.content = b'{"fileId": "test-id"}'
+        mock_response.raise_for_status.return_value = None
+        mock_post.return_value = mock_response
+        
+        self.client.upload_file(io.BytesIO(b"%PDF-1.4"), "test.pdf")
+        
+        _, kwargs = mock_post.call_args
+        self.assertIsInstance(kwargs["data"], MultipartEncoder)
+        self.assertTrue(kwargs["headers"]["Content-Type"].startswith("multipart/form-data"))
+        self.assertIn(b"application/pdf", kwargs["data"].to_string())
+    
+    @patch('services.api_client.requests.Session.post')
+    def test_upload_file_reports_progress(self, mock_post):
+        mock_response = Mock()
+        mock_response.content = b'{"fileId": "test-id"}'
+        mock_response.raise_for_status.return_value = None
+        mock_post.return_value = mock_response
+        progress = []
+        
+        self.client.upload_file(io.BytesIO(b"%PDF-1.4"), "test.pdf", progress.append)
+        
+        # Drain the body as the transport would
+        mock_post.call_args.kwargs["data"].to_string()
+        self.assertTrue(progress)
+        self.assertEqual(progress[-1], 1.0)
+    
+    @patch('services.api_client.requests.Session.post')
     def test_upload_file_network_error(self, mock_post):
         # Mock network error
         mock_post.side_effect = requests.exceptions.ConnectionError("Connection failed")
@@ -37,7 +69,7 @@ class TestApiClient(unittest.TestCase):
         self.assertIn("Connection failed", result["message"])
         self.assertIsNone(result["fileId"])
     
-    @patch('services.api_client.requests.post')
+    @patch('services.api_client.requests.Session.post')
     def test_upload_file_server_error(self, mock_post):
         # Mock server error
         mock_response = Mock()
@@ -49,15 +81,28 @@ class TestApiClient(unittest.TestCase):
         self.assertTrue(result["error"])
         self.assertIn("500 Server Error", result["message"])
     
-    @patch('services.api_client.requests.get')
+    @patch('services.api_client.requests.Session.post')
+    def test_upload_file_invalid_json(self, mock_post):
+        # Mock a non-JSON response body
+        mock_response = Mock()
+        mock_response.content = b"<html>Bad Gateway</html>"
+        mock_response.raise_for_status.return_value = None
+        mock_post.return_value = mock_response
+        
+        result = self.client.upload_file(b"test content", "test.txt")
+        
+        self.assertTrue(result["error"])
+        self.assertIsNone(result["fileId"])
+    
+    @patch('services.api_client.requests.Session.get')
     def test_get_file_result_success(self, mock_get):
         # Mock successful response
         mock_response = Mock()
-        mock_response.json.return_value = {
+        mock_response.content = orjson.dumps({
             "fileId": "test-id",
             "category": "invoice",
             "entities": []
-        }
+        })
         mock_response.raise_for_status.return_value = None
         mock_get.return_value = mock_response
         
@@ -65,8 +110,9 @@ class TestApiClient(unittest.TestCase):
         
         self.assertIsNotNone(result)
         self.assertEqual(result["fileId"], "test-id")
+        self.assertEqual(mock_get.call_args.args[0], "http://localhost:8080/api/files/test-id")
     
-    @patch('services.api_client.requests.get')
+    @patch('services.api_client.requests.Session.get')
     def test_get_file_result_not_found(self, mock_get):
         # Mock 404 response
         mock_response = Mock()
@@ -77,28 +123,13 @@ class TestApiClient(unittest.TestCase):
         
         self.assertIsNone(result)
     
-    @patch('services.api_client.requests.get')
-    def test_download_file_success(self, mock_get):
-        # Mock successful download
-        mock_response = Mock()
-        mock_response.content = b"file content"
-        mock_response.raise_for_status.return_value = None
-        mock_get.return_value = mock_response
-        
-        result = self.client.download_file("test-id")
-        
-        self.assertEqual(result, b"file content")
+    def test_download_url(self):
+        self.assertEqual(self.client.download_url("test-id"), "http://localhost:8080/api/files/test-id/download")
     
-    @patch('services.api_client.requests.get')
-    def test_download_file_not_found(self, mock_get):
-        # Mock 404 response
-        mock_response = Mock()
-        mock_response.raise_for_status.side_effect = requests.exceptions.HTTPError("404 Not Found")
-        mock_get.return_value = mock_response
-        
-        result = self.client.download_file("non-existent-id")
-        
-        self.assertIsNone(result)
+    def test_download_url_uses_public_url(self):
+        client = ApiClient("http://backend:8080", public_url="https://docs.example.com")
+        self.assertEqual(client.download_url("test-id"), "https://docs.example.com/api/files/test-id/download")
+        self.assertEqual(client.base_url, "http://backend:8080")
     
     def test_base_url_configuration(self):
         custom_client = ApiClient("http://custom:9000")
@@ -107,6 +138,12 @@ class TestApiClient(unittest.TestCase):
     def test_default_base_url(self):
         default_client = ApiClient()
         self.assertEqual(default_client.base_url, "http://localhost:8080")
+    
+    def test_session_retry_policy(self):
+        adapter = self.client.session.get_adapter("http://localhost:8080")
+        self.assertIsInstance(self.client.session, requests.Session)
+        self.assertEqual(adapter.max_retries.total, 2)
+        self.assertFalse(adapter.max_retries.raise_on_status)
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,50 @@
+import unittest
+from components.results_display import confidence_color, _arrow_table, _csv_bytes
+
+class TestConfidenceColor(unittest.TestCase):
+    
+    def test_low_confidence_is_red(self):
+        self.assertEqual(confidence_color(0), "🔴")
+        self.assertEqual(confidence_color(0.5), "🔴")
+    
+    def test_medium_confidence_is_yellow(self):
+        self.assertEqual(confidence_color(0.51), "🟡")
+        self.assertEqual(confidence_color(0.8), "🟡")
+    
+    def test_high_confidence_is_green(self):
+        self.assertEqual(confidence_color(0.81), "🟢")
+        self.assertEqual(confidence_color(1.0), "🟢")
+
+class TestTableConversion(unittest.TestCase):
+    
+    def test_arrow_table_keeps_uniform_columns_typed(self):
+        table = _arrow_table(["item", "qty"], [["Widget", 2], ["Gadget", 5]])
+        
+        self.assertEqual(table.column_names, ["item", "qty"])
+        self.assertEqual(table.column("qty").to_pylist(), [2, 5])
+    
+    def test_arrow_table_falls_back_to_strings_for_mixed_columns(self):
+        table = _arrow_table(["amount"], [[1], ["n/a"], [None]])
+        
+        self.assertEqual(table.column("amount").to_pylist(), ["1", "n/a", None])
+    
+    def test_arrow_table_pads_short_rows(self):
+        table = _arrow_table(["item", "qty", "price"], [["Widget", "2", "5"], ["Total", "10"]])
+        
+        self.assertEqual(table.num_rows, 2)
+        self.assertEqual(table.column("price").to_pylist(), ["5", None])
+    
+    def test_arrow_table_rejects_long_rows(self):
+        with self.assertRaises(ValueError):
+            _arrow_table(["item", "qty"], [["Widget", "2", "extra"]])
+    
+    def test_csv_bytes(self):
+        table = _arrow_table(["item", "price"], [["Widget, large", 2.5], ["Gadget", 3]])
+        
+        self.assertEqual(
+            _csv_bytes(table),
+            b'"item","price"\n"Widget, large",2.5\n"Gadget",3\n'
+        )
+
+if __name__ == '__main__':
+    unittest.main()